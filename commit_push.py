@@ -14,14 +14,20 @@ import subprocess
 import sys
 import os
 import json
+import hashlib
+import functools
+import importlib.util
 import argparse
+import itertools
+import re
 from pathlib import Path
-from typing import Optional, Dict, List, Tuple
-from dataclasses import dataclass
+from typing import Optional, Dict, List, Set, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Configuration
-@dataclass
+# Configuration (immutable: build a new instance instead of mutating one)
+@dataclass(frozen=True, slots=True)
 class Config:
     repo_name: str = "auto-commit-push"
     username: str = "khafidmedheb"
@@ -29,28 +35,46 @@ class Config:
     max_commit_length: int = 72
     use_conventional_commits: bool = True
     ollama_model: str = "mistral"
+    use_message_cache: bool = True
+    # Reuse one SSH connection across pushes (OpenSSH ControlMaster)
+    ssh_multiplex: bool = True
+    _remote_url: str = field(init=False, repr=False, default="")
+    
+    def __post_init__(self):
+        object.__setattr__(self, '_remote_url', f"git@github.com:{self.username}/{self.repo_name}.git")
     
     @property
     def remote_url(self) -> str:
-        return f"git@github.com:{self.username}/{self.repo_name}.git"
+        return self._remote_url
+
+# File classification used to pick commit types
+DOC_EXTS = frozenset({'.md', '.rst', '.txt'})
+CFG_EXTS = frozenset({'.json', '.yml', '.yaml', '.toml', '.ini'})
+SRC_EXTS = frozenset({'.py', '.js', '.ts', '.java', '.cpp'})
 
-# Global config instance
-config = Config()
+# Strips surrounding quotes and "Commit message:"-style prefixes from model output in one match.
+# Quotes are only removed in matching pairs (backreferences), before or after the prefix.
+_CLEAN_RE = re.compile(
+    r'^\s*("?)\s*(?:(?:commit message|message|git commit)\s*:\s*)?("?)(.*?)\2\1\s*$',
+    re.IGNORECASE | re.DOTALL
+)
 
 class GitOperations:
     """Handles all Git operations with enhanced error handling."""
     
     @staticmethod
-    def run_command(command: str, capture_output: bool = True, check: bool = True) -> Optional[str]:
-        """Execute system command with enhanced error handling."""
+    def run_command(argv: List[str], capture_output: bool = True, check: bool = True,
+                    input_text: Optional[str] = None) -> Optional[str]:
+        """Execute system command (argument list, no shell) with enhanced error handling."""
+        command = ' '.join(argv)
         try:
             result = subprocess.run(
-                command, 
-                shell=True, 
+                argv, 
                 capture_output=capture_output, 
                 text=True, 
                 check=check,
-                encoding='utf-8'
+                encoding='utf-8',
+                input=input_text
             )
             return result.stdout.strip() if capture_output else None
         except subprocess.CalledProcessError as e:
@@ -63,15 +87,75 @@ class GitOperations:
         except UnicodeDecodeError:
             print(f"⚠️ Encoding issue with command: {command}")
             return None
+        except OSError as e:
+            print(f"❌ Command failed: {command} ({e})")
+            return None
+
+    @staticmethod
+    def list_paths(argv: List[str], check: bool = True) -> List[str]:
+        """Run a git command with -z output and return the NUL-separated records (paths come unquoted)."""
+        try:
+            result = subprocess.run(argv, capture_output=True, check=check)
+        except subprocess.CalledProcessError as e:
+            print(f"❌ Command failed: {' '.join(argv)}")
+            print(f"   Exit code: {e.returncode}")
+            if e.stderr:
+                print(f"   Error: {os.fsdecode(e.stderr)}")
+            return []
+        except OSError as e:
+            print(f"❌ Command failed: {' '.join(argv)} ({e})")
+            return []
+        if result.returncode != 0:
+            return []
+        return [os.fsdecode(path) for path in result.stdout.split(b'\x00') if path]
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def find_repo() -> Optional[Tuple[str, str]]:
+        """Locate the work tree root and git directory once per process."""
+        result = GitOperations.run_command(
+            ["git", "rev-parse", "--show-toplevel", "--absolute-git-dir"], check=False
+        )
+        if not result:
+            return None
+        lines = result.split('\n')
+        return (lines[0], lines[1]) if len(lines) == 2 else None
 
     @staticmethod
     def is_git_repo() -> bool:
-        """Check if current directory is a Git repository."""
-        return Path(".git").exists()
+        """Check if current directory is inside a Git work tree (worktrees and submodules included)."""
+        return GitOperations.find_repo() is not None
+
+    @staticmethod
+    def pin_repo() -> None:
+        """Move to the repository root and export its location so git skips discovery on every call."""
+        repo = GitOperations.find_repo()
+        if repo is None:
+            return
+        work_tree, git_dir = repo
+        os.chdir(work_tree)
+        os.environ.setdefault("GIT_DIR", git_dir)
+        os.environ.setdefault("GIT_WORK_TREE", work_tree)
+
+    @staticmethod
+    def has_changes() -> bool:
+        """Cheap dirty check: one unparsed status call, no per-file classification."""
+        try:
+            # Untracked files must count here (they get committed too), but "normal" mode
+            # collapses untracked directories instead of listing every file inside them
+            result = subprocess.run(
+                ["git", "status", "--porcelain", "-z", "--untracked-files=normal"],
+                capture_output=True,
+                check=True
+            )
+        except (subprocess.CalledProcessError, OSError):
+            # Let the full status path report the problem
+            return True
+        return len(result.stdout) > 0
 
     @staticmethod
     def get_repo_status() -> Dict[str, List[str]]:
-        """Get comprehensive repository status."""
+        """Get comprehensive repository status from a single porcelain v2 scan."""
         status = {
             'untracked': [],
             'modified': [],
@@ -80,60 +164,168 @@ class GitOperations:
             'renamed': []
         }
         
-        # Get untracked files
-        untracked = GitOperations.run_command("git ls-files --others --exclude-standard")
-        if untracked:
-            status['untracked'] = untracked.split('\n')
-        
-        # Get modified files
-        modified = GitOperations.run_command("git diff --name-only")
-        if modified:
-            status['modified'] = modified.split('\n')
-        
-        # Get staged files
-        staged = GitOperations.run_command("git diff --cached --name-only")
-        if staged:
-            status['staged'] = staged.split('\n')
-            
-        # Get deleted files
-        deleted = GitOperations.run_command("git ls-files --deleted")
-        if deleted:
-            status['deleted'] = deleted.split('\n')
+        try:
+            result = subprocess.run(
+                ["git", "status", "--porcelain=v2", "-z", "--untracked-files=all"],
+                capture_output=True,
+                check=True
+            )
+        except (subprocess.CalledProcessError, OSError) as e:
+            print(f"❌ Command failed: git status ({e})")
+            return status
+        
+        records = iter(result.stdout.split(b'\x00'))
+        for record in records:
+            if not record:
+                continue
+            kind = record[:1]
+            if kind == b'?':
+                status['untracked'].append(os.fsdecode(record[2:]))
+            elif kind in (b'1', b'2', b'u'):
+                # Ordinary (1) entries carry 8 fields before the path, renames (2)
+                # carry 9, unmerged (u) carry 10
+                fields = {b'1': 8, b'2': 9, b'u': 10}[kind]
+                parts = record.split(b' ', fields)
+                index_state, worktree_state = chr(parts[1][0]), chr(parts[1][1])
+                path = os.fsdecode(parts[fields])
+                if kind == b'2':
+                    # The original path follows as its own NUL-terminated record
+                    next(records, None)
+                    status['renamed'].append(path)
+                if kind == b'u':
+                    status['modified'].append(path)
+                    continue
+                if index_state != '.':
+                    status['staged'].append(path)
+                if worktree_state == 'D':
+                    status['deleted'].append(path)
+                elif worktree_state != '.':
+                    status['modified'].append(path)
             
         return status
 
     @staticmethod
     def get_file_changes() -> Dict[str, int]:
-        """Get detailed file change statistics."""
-        stats = GitOperations.run_command("git diff --numstat")
-        if not stats:
-            stats = GitOperations.run_command("git diff --cached --numstat")
-        
-        changes = {'additions': 0, 'deletions': 0, 'files': 0}
-        if stats:
-            for line in stats.split('\n'):
-                parts = line.split('\t')
-                if len(parts) >= 2:
-                    try:
-                        changes['additions'] += int(parts[0]) if parts[0] != '-' else 0
-                        changes['deletions'] += int(parts[1]) if parts[1] != '-' else 0
-                        changes['files'] += 1
-                    except ValueError:
-                        continue
-                        
-        return changes
+        """Get detailed file change statistics (staged and unstaged, against HEAD)."""
+        records = GitOperations.list_paths(["git", "diff", "--numstat", "-z", "HEAD"], check=False)
+        if not records:
+            # No HEAD yet (fresh repository): fall back to the index
+            records = GitOperations.list_paths(["git", "diff", "--cached", "--numstat", "-z"])
+        
+        # Stat records are "<added>\t<deleted>\t<path>"; renames leave the path empty and are
+        # followed by bare "<old>" and "<new>" records, which have no tab-separated counts.
+        # Binary files report "-" for both counts.
+        rows = [row for row in (record.split('\t', 2) for record in records)
+                if len(row) == 3 and (row[0].isdigit() or row[0] == '-')]
+        return {
+            'additions': sum(int(row[0]) for row in rows if row[0].isdigit()),
+            'deletions': sum(int(row[1]) for row in rows if row[1].isdigit()),
+            'files': len(rows)
+        }
 
     @staticmethod
     def get_recent_commits(limit: int = 5) -> List[str]:
         """Get recent commit messages for context."""
-        result = GitOperations.run_command(f"git log --oneline -n {limit}")
-        return result.split('\n') if result else []
+        return GitOperations.list_paths(["git", "log", "-z", "--oneline", "-n", str(limit)], check=False)
+
+    @staticmethod
+    def ssh_env(multiplex: bool = True) -> Dict[str, str]:
+        """Environment for network git commands, with SSH connection multiplexing if enabled."""
+        env = os.environ.copy()
+        # ControlMaster is not available on Windows OpenSSH
+        if not multiplex or os.name == 'nt' or not (Path.home() / ".ssh").is_dir():
+            return env
+        # GIT_SSH_COMMAND would override any SSH setup the user already has: leave it alone
+        if "GIT_SSH_COMMAND" in env or "GIT_SSH" in env:
+            return env
+        if GitOperations.run_command(["git", "config", "core.sshCommand"], check=False):
+            return env
+        env["GIT_SSH_COMMAND"] = (
+            "ssh -o ControlMaster=auto -o ControlPath=~/.ssh/cm-%r@%h:%p -o ControlPersist=600"
+        )
+        return env
+
+    @staticmethod
+    def push(remote: str, branch: str, ssh_multiplex: bool = True) -> bool:
+        """Push a branch and report whether every ref was accepted."""
+        command = ["git", "push", "--porcelain", "-u", remote, branch]
+        try:
+            result = subprocess.run(
+                command,
+                capture_output=True,
+                text=True,
+                encoding='utf-8',
+                env=GitOperations.ssh_env(ssh_multiplex)
+            )
+        except OSError as e:
+            print(f"❌ Command failed: {' '.join(command)} ({e})")
+            return False
+        
+        # Porcelain ref lines are "<flag>\t<from>:<to>\t<summary>"; "!" marks a rejected ref
+        rejected = [line for line in result.stdout.split('\n') if line.startswith('!\t')]
+        if result.returncode != 0 or rejected:
+            for line in rejected:
+                ref = line.split('\t')[1]
+                print(f"   Rejected: {ref}")
+            if result.stderr.strip():
+                print(f"   Error: {result.stderr.strip()}")
+            return False
+        return True
+
+class MessageCache:
+    """On-disk cache of AI commit messages keyed by model, prompt and diff."""
+    
+    # Bump whenever the prompt template changes so stale messages are not reused
+    PROMPT_VERSION = "1"
+    MAX_ENTRIES = 200
+    
+    def __init__(self, path: Optional[Path] = None):
+        cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        self.path = path or Path(cache_home) / "commit_push" / "messages.json"
+        self._entries: Optional[Dict[str, str]] = None
+
+    @classmethod
+    def make_key(cls, model_name: str, prompt: str, diff: str) -> str:
+        """Hash everything the generated message depends on."""
+        payload = "\x00".join((model_name, cls.PROMPT_VERSION, prompt, diff))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _load(self) -> Dict[str, str]:
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, key: str) -> Optional[str]:
+        return self._load().get(key)
+
+    def set(self, key: str, message: str) -> None:
+        entries = self._load()
+        entries.pop(key, None)
+        entries[key] = message
+        # Keep only the most recent entries (dicts preserve insertion order)
+        for stale in list(entries)[:-self.MAX_ENTRIES]:
+            del entries[stale]
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps(entries, ensure_ascii=False), encoding='utf-8')
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Could not write message cache: {e}")
 
 class CommitMessageGenerator:
     """Enhanced AI-powered commit message generator."""
     
-    def __init__(self, model_name: str = "mistral"):
+    def __init__(self, model_name: str = "mistral", cache: Optional[MessageCache] = None,
+                 config: Optional[Config] = None):
         self.model_name = model_name
+        self.cache = cache
+        self.config = config if config is not None else Config(ollama_model=model_name)
+        # Created on first use so the LangChain import stays off the --no-ai / cache-hit paths
+        self._llm = None
         self.conventional_types = {
             'feat': '✨',
             'fix': '🐛', 
@@ -148,28 +340,52 @@ class CommitMessageGenerator:
             'security': '🔒',
             'config': '⚙️'
         }
+        # type(scope)!: description
+        self._cc_re = re.compile(
+            r'^(' + '|'.join(map(re.escape, self.conventional_types)) + r')(\([^)]+\))?!?: .+$'
+        )
+
+    @staticmethod
+    def classify_files(status: Dict[str, List[str]]) -> Set[str]:
+        """Classify all changed files in a single pass."""
+        categories = set()
+        for f in itertools.chain.from_iterable(status.values()):
+            name_lower = f.lower()
+            ext = os.path.splitext(name_lower)[1]
+            if 'test' in name_lower:
+                categories.add('test')
+            if 'fix' in name_lower:
+                categories.add('fix')
+            if ext == '.md':
+                categories.add('markdown')
+            if ext in DOC_EXTS:
+                categories.add('docs')
+            elif ext in CFG_EXTS:
+                categories.add('config')
+            elif ext in SRC_EXTS:
+                categories.add('source')
+        return categories
 
     def analyze_changes(self, status: Dict[str, List[str]], stats: Dict[str, int]) -> str:
         """Analyze changes to determine commit type and scope."""
-        analysis = []
-        
-        # Determine primary change type
-        if any('test' in f.lower() for files in status.values() for f in files):
-            analysis.append("test files")
-        if any(f.endswith(('.md', '.rst', '.txt')) for files in status.values() for f in files):
-            analysis.append("documentation")
-        if any(f.endswith(('.json', '.yml', '.yaml', '.toml', '.ini')) for files in status.values() for f in files):
-            analysis.append("configuration")
-        if any(f.endswith(('.py', '.js', '.ts', '.java', '.cpp')) for files in status.values() for f in files):
-            analysis.append("source code")
+        categories = self.classify_files(status)
+        labels = [
+            ('test', "test files"),
+            ('docs', "documentation"),
+            ('config', "configuration"),
+            ('source', "source code"),
+        ]
+        analysis = [label for category, label in labels if category in categories]
             
         return ", ".join(analysis) if analysis else "general changes"
 
-    def generate_enhanced_message(self, status: Dict[str, List[str]], stats: Dict[str, int], recent_commits: List[str]) -> Optional[str]:
-        """Generate enhanced commit message with better context."""
+    def generate_enhanced_message(self, status: Dict[str, List[str]], stats: Dict[str, int], recent_commits: List[str],
+                                  diff: str = "") -> Optional[str]:
+        """Generate enhanced commit message with better context.
+
+        ``diff`` is the working tree diff read by the caller before staging; it only feeds the cache key.
+        """
         try:
-            from langchain_ollama import OllamaLLM
-            
             # Build comprehensive context
             change_analysis = self.analyze_changes(status, stats)
             files_summary = self._build_files_summary(status)
@@ -201,12 +417,26 @@ EXAMPLES:
 
 Generate ONE commit message only:"""
 
-            llm = OllamaLLM(model=self.model_name)
-            message = llm.invoke(prompt).strip()
+            cache_key = None
+            if self.cache is not None:
+                cache_key = MessageCache.make_key(self.model_name, prompt, diff)
+                cached = self.cache.get(cache_key)
+                if cached:
+                    print("♻️ Reusing cached commit message")
+                    return cached
+
+            # Only pay the LangChain import cost once we know the model is actually needed
+            if importlib.util.find_spec("langchain_ollama") is None:
+                return self._handle_missing_dependency()
+            message = self._stream_first_line(self._get_llm(), prompt)
             
             # Clean and validate message
             message = self._clean_message(message)
-            return message if self._validate_message(message) else None
+            if not self._validate_message(message):
+                return None
+            if cache_key is not None:
+                self.cache.set(cache_key, message)
+            return message
             
         except ImportError:
             return self._handle_missing_dependency()
@@ -214,6 +444,29 @@ Generate ONE commit message only:"""
             print(f"⚠️ AI generation failed: {e}")
             return None
 
+    def _get_llm(self):
+        """Return the shared Ollama client, creating it on first use."""
+        if self._llm is None:
+            from langchain_ollama import OllamaLLM
+
+            # Cap generation: a subject line never needs more than a few dozen tokens.
+            # keep_alive keeps the model loaded in Ollama between consecutive runs.
+            self._llm = OllamaLLM(model=self.model_name, num_predict=64, keep_alive="5m")
+        return self._llm
+
+    def _stream_first_line(self, llm, prompt: str) -> str:
+        """Stream the model output and stop as soon as a full subject line is available."""
+        # Leave room for prefixes/quotes that _clean_message strips afterwards
+        budget = self.config.max_commit_length + 20
+        buffer = ""
+        for chunk in llm.stream(prompt):
+            buffer += chunk
+            text = buffer.lstrip()
+            if '\n' in text or len(text) >= budget:
+                # Leaving the loop closes the stream and stops generation server-side
+                break
+        return buffer.strip().split('\n', 1)[0].strip()
+
     def _build_files_summary(self, status: Dict[str, List[str]]) -> str:
         """Build a summary of changed files."""
         summary = []
@@ -240,19 +493,12 @@ Generate ONE commit message only:"""
 
     def _clean_message(self, message: str) -> str:
         """Clean and format commit message."""
-        # Remove quotes
-        if message.startswith('"') and message.endswith('"'):
-            message = message[1:-1]
-        
-        # Remove any prefixes like "Commit message:"
-        prefixes = ["commit message:", "message:", "git commit:"]
-        for prefix in prefixes:
-            if message.lower().startswith(prefix):
-                message = message[len(prefix):].strip()
+        message = _CLEAN_RE.match(message).group(3)
         
         # Ensure proper length
-        if len(message) > config.max_commit_length:
-            message = message[:config.max_commit_length - 3] + "..."
+        max_length = self.config.max_commit_length
+        if len(message) > max_length:
+            message = message[:max_length - 3] + "..."
             
         return message
 
@@ -261,9 +507,9 @@ Generate ONE commit message only:"""
         if not message or len(message) < 10:
             return False
         
-        if config.use_conventional_commits:
+        if self.config.use_conventional_commits:
             # Check for conventional commit format
-            return ':' in message and any(msg_type in message.lower() for msg_type in self.conventional_types.keys())
+            return bool(self._cc_re.match(message))
         
         return True
 
@@ -284,12 +530,13 @@ Generate ONE commit message only:"""
             return "chore: update repository"
         
         # Determine commit type based on files
+        categories = self.classify_files(status)
         commit_type = "feat"
-        if any('fix' in f.lower() for files in status.values() for f in files):
+        if 'fix' in categories:
             commit_type = "fix"
-        elif any(f.endswith('.md') for files in status.values() for f in files):
+        elif 'markdown' in categories:
             commit_type = "docs"
-        elif any('test' in f.lower() for files in status.values() for f in files):
+        elif 'test' in categories:
             commit_type = "test"
         
         scope = ""
@@ -314,12 +561,15 @@ class PreCommitHooks:
         hooks_dir.mkdir(exist_ok=True)
         
         pre_commit_hook = hooks_dir / "pre-commit"
-        hook_content = """#!/bin/sh
+        hook_content = r"""#!/bin/sh
 # Auto-generated pre-commit hook
 echo "🔍 Running pre-commit checks..."
 
-# Check for large files (>10MB)
-large_files=$(git diff --cached --name-only | xargs -I {} find {} -size +10M 2>/dev/null)
+# Check for large files (>10MB): read staged blob sizes from git in one pipeline
+large_files=$(git diff --cached --raw --no-abbrev --no-renames --diff-filter=d \
+    | awk -F'\t' '{ split($1, meta, " "); print meta[4], $2 }' \
+    | git cat-file --batch-check='%(objectsize) %(rest)' \
+    | awk '$1 > 10485760 { sub(/^[0-9]+ /, ""); print }')
 if [ ! -z "$large_files" ]; then
     echo "❌ Large files detected (>10MB):"
     echo "$large_files"
@@ -328,7 +578,8 @@ if [ ! -z "$large_files" ]; then
 fi
 
 # Check for common secrets patterns
-secrets=$(git diff --cached | grep -E "(password|secret|key|token).*=" | grep -v "# " || true)
+# Only added lines matter; -U0 drops the context lines from the scan
+secrets=$(git diff --cached -U0 | grep -E "^\+.*(password|secret|key|token).*=" | grep -v -e "^+++ " -e "# " || true)
 if [ ! -z "$secrets" ]; then
     echo "⚠️ Potential secrets detected in staged changes:"
     echo "$secrets"
@@ -350,19 +601,38 @@ echo "✅ Pre-commit checks passed"
         os.chmod(pre_commit_hook, 0o755)
         print("✅ Pre-commit hooks installed")
 
+    @staticmethod
+    def _syntax_error(file: str) -> Optional[str]:
+        """Compile a file in-process and return the syntax error message, if any.
+
+        Read failures propagate as OSError: they are not syntax errors.
+        """
+        source = Path(file).read_bytes()
+        try:
+            compile(source, file, 'exec', dont_inherit=True)
+        except (SyntaxError, ValueError) as e:
+            return str(e)
+        return None
+
     @staticmethod
     def check_code_quality():
         """Run basic code quality checks."""
-        python_files = GitOperations.run_command("git diff --cached --name-only --diff-filter=ACM | grep '\\.py$'")
+        python_files = GitOperations.list_paths(
+            ["git", "diff", "--cached", "--name-only", "-z", "--diff-filter=ACM", "--", "*.py"]
+        )
         if python_files:
             print("🐍 Checking Python code quality...")
-            for file in python_files.split('\n'):
-                if file:
-                    # Basic syntax check
-                    result = subprocess.run([sys.executable, "-m", "py_compile", file], 
-                                         capture_output=True, text=True)
-                    if result.returncode != 0:
-                        print(f"❌ Syntax error in {file}")
+            # Basic syntax check, without spawning an interpreter per file
+            with ThreadPoolExecutor(max_workers=min(8, len(python_files))) as executor:
+                futures = [executor.submit(PreCommitHooks._syntax_error, file) for file in python_files]
+                for file, future in zip(python_files, futures):
+                    try:
+                        error = future.result()
+                    except OSError as e:
+                        print(f"⚠️ Could not read {file}, skipping syntax check: {e}")
+                        continue
+                    if error:
+                        print(f"❌ Syntax error in {file}: {error}")
                         return False
         return True
 
@@ -374,6 +644,7 @@ def main():
     parser.add_argument("--no-ai", action="store_true", help="Skip AI message generation")
     parser.add_argument("--message", "-m", help="Use custom commit message")
     parser.add_argument("--model", default="mistral", help="Ollama model to use")
+    parser.add_argument("--no-cache", action="store_true", help="Always query the model, ignoring cached messages")
     
     args = parser.parse_args()
     
@@ -383,8 +654,7 @@ def main():
             PreCommitHooks.install_hooks()
             return
         
-        # Update config
-        config.ollama_model = args.model
+        config = Config(ollama_model=args.model, use_message_cache=not args.no_cache)
         
         print("🚀 Enhanced Git Commit Push Assistant")
         print(f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -394,12 +664,35 @@ def main():
             if args.dry_run:
                 print("DRY RUN: Would initialize Git repository")
             else:
-                GitOperations.run_command("git init", capture_output=False)
+                GitOperations.run_command(["git", "init"], capture_output=False)
+                GitOperations.find_repo.cache_clear()
                 print("📁 Git repository initialized")
+        GitOperations.pin_repo()
         
-        # Get repository status
-        status = GitOperations.get_repo_status()
-        stats = GitOperations.get_file_changes()
+        # Nothing to commit is the most common run: bail out before the full status scan
+        if not GitOperations.has_changes():
+            print("ℹ️ No changes detected in repository")
+            print("✨ Repository is up to date!")
+            return
+        
+        # Gather repository state: these reads are independent, run them concurrently
+        use_ai = not args.message and not args.no_ai
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = {
+                executor.submit(GitOperations.get_repo_status): 'status',
+                executor.submit(GitOperations.get_file_changes): 'stats',
+                executor.submit(GitOperations.get_recent_commits): 'recent_commits',
+                executor.submit(GitOperations.run_command, ["git", "remote", "get-url", "origin"], check=False): 'remote',
+            }
+            if use_ai and config.use_message_cache:
+                # Read before staging so the cache key does not depend on the index state
+                futures[executor.submit(GitOperations.run_command, ["git", "diff", "HEAD"], check=False)] = 'diff'
+            repo_state = {futures[future]: future.result() for future in as_completed(futures)}
+        status = repo_state['status']
+        stats = repo_state['stats']
+        recent_commits = repo_state['recent_commits']
+        existing_remote = repo_state['remote']
+        diff = repo_state.get('diff') or ""
         
         # Check if there are changes
         has_changes = any(files for files in status.values())
@@ -420,44 +713,50 @@ def main():
             print("❌ Code quality checks failed")
             return
         
-        # Stage changes
-        GitOperations.run_command("git add .", capture_output=False)
-        print("📁 Changes staged")
-        
-        # Generate commit message
+        # Stage changes while the commit message is generated. The generator runs no git
+        # command itself, so "git add" is the only process touching the index here.
         commit_message = args.message
-        if not commit_message and not args.no_ai:
-            print("🤖 Generating AI commit message...")
-            generator = CommitMessageGenerator(config.ollama_model)
-            recent_commits = GitOperations.get_recent_commits()
-            commit_message = generator.generate_enhanced_message(status, stats, recent_commits)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            stage_future = executor.submit(GitOperations.run_command, ["git", "add", "."])
+            message_future = None
+            if use_ai:
+                print("🤖 Generating AI commit message...")
+                cache = MessageCache() if config.use_message_cache else None
+                generator = CommitMessageGenerator(config.ollama_model, cache, config)
+                message_future = executor.submit(generator.generate_enhanced_message, status, stats, recent_commits, diff)
+            
+            staged = stage_future.result()
+            if message_future is not None:
+                commit_message = message_future.result()
+        
+        if staged is None:
+            print("❌ Staging failed, nothing was committed")
+            return
+        print("📁 Changes staged")
         
         # Fallback message
         if not commit_message:
-            generator = CommitMessageGenerator()
+            generator = CommitMessageGenerator(config=config)
             commit_message = generator.generate_fallback_message(status, stats)
             print(f"📝 Using fallback message: {commit_message}")
         else:
             print(f"✅ Commit message: {commit_message}")
         
         # Create commit
-        GitOperations.run_command(f'git commit -m "{commit_message}"', capture_output=False)
+        # Message goes through stdin: no quoting issues, multi-line messages work as-is
+        GitOperations.run_command(["git", "commit", "-F", "-"], capture_output=False, input_text=commit_message)
         print(f"✅ Commit created: {commit_message}")
         
         # Configure branch and remote
-        GitOperations.run_command(f"git branch -M {config.default_branch}", capture_output=False)
+        GitOperations.run_command(["git", "branch", "-M", config.default_branch], capture_output=False)
         
-        existing_remote = GitOperations.run_command("git remote get-url origin")
         if not existing_remote:
-            GitOperations.run_command(f"git remote add origin {config.remote_url}", capture_output=False)
+            GitOperations.run_command(["git", "remote", "add", "origin", config.remote_url], capture_output=False)
             print(f"📡 Remote configured: {config.remote_url}")
         
         # Push to GitHub
         print("🚀 Pushing to GitHub...")
-        push_result = GitOperations.run_command(f"git push -u origin {config.default_branch}", 
-                                              capture_output=True, check=False)
-        
-        if push_result is not None:
+        if GitOperations.push("origin", config.default_branch, config.ssh_multiplex):
             print("✅ Successfully pushed to GitHub!")
         else:
             print("⚠️ Push failed. Check SSH connection and repository permissions.")
@@ -1,19 +1,27 @@
 import os
+import sys
+import argparse
 import subprocess
+import importlib.util
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import re
+import random
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set, Tuple, TYPE_CHECKING
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from itertools import islice
 import asyncio
 
-# Imports LangChain et OpenAI
-from langchain.agents import AgentExecutor, create_openai_functions_agent
-from langchain.tools import Tool
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain.schema import HumanMessage, AIMessage
-from langchain.memory import ConversationBufferMemory
-from langchain.callbacks import StreamingStdOutCallbackHandler
+# Les imports LangChain et OpenAI sont coûteux : ils sont faits à la demande
+if TYPE_CHECKING:
+    from langchain.agents import AgentExecutor
+    from langchain.tools import Tool
 
 # === CONFIGURATION ===
 class SmartDeployConfig:
@@ -32,69 +40,148 @@ class SmartDeployConfig:
             raise Exception("⚠️  OPENAI_API_KEY non défini dans l'environnement.")
 
 # === ANALYSEUR DE PROJET INTELLIGENT ===
+@dataclass
+class ScanResult:
+    """Résultat d'un parcours unique de l'arborescence du projet"""
+    languages: Counter = field(default_factory=Counter)
+    counts: Dict[str, int] = field(default_factory=lambda: {"total": 0, "code": 0, "config": 0})
+    config_files_present: Set[str] = field(default_factory=set)
+
+# Tables d'extensions partagées par tous les parcours
+LANGUAGE_MAP = {
+    '.py': 'Python', '.js': 'JavaScript', '.ts': 'TypeScript',
+    '.java': 'Java', '.cpp': 'C++', '.c': 'C', '.cs': 'C#',
+    '.php': 'PHP', '.rb': 'Ruby', '.go': 'Go', '.rs': 'Rust',
+    '.swift': 'Swift', '.kt': 'Kotlin', '.scala': 'Scala',
+    '.html': 'HTML', '.css': 'CSS', '.scss': 'SCSS',
+    '.vue': 'Vue', '.jsx': 'React', '.tsx': 'React'
+}
+CODE_EXTS = frozenset({'.py', '.js', '.ts', '.java', '.cpp', '.c', '.cs', '.php', '.rb', '.go', '.rs'})
+CONFIG_EXTS = frozenset({'.json', '.yml', '.yaml', '.toml', '.ini', '.cfg', '.conf'})
+
+@lru_cache(maxsize=1)
+def _language_table() -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+    """Extension sans point -> (catégorie, langage) : une seule recherche par fichier lors du parcours"""
+    return {
+        ext[1:]: ("code" if ext in CODE_EXTS else "config" if ext in CONFIG_EXTS else None, LANGUAGE_MAP.get(ext))
+        for ext in LANGUAGE_MAP.keys() | CODE_EXTS | CONFIG_EXTS
+    }
+
+# Dossiers ignorés lors du parcours du projet (dépendances, environnements, artefacts de build)
+SKIP_DIRS = frozenset({"node_modules", "venv", ".venv", "__pycache__", "dist", "build", "target", "vendor", ".git"})
+
+# Frameworks recherchés dans chaque fichier de configuration
+CONFIG_FRAMEWORKS = {
+    'package.json': ['React', 'Vue', 'Angular', 'Express'],
+    'requirements.txt': ['Django', 'Flask', 'FastAPI'],
+    'pom.xml': ['Spring', 'Maven'],
+    'build.gradle': ['Spring Boot', 'Android'],
+    'Cargo.toml': ['Rust'],
+    'go.mod': ['Go'],
+    'composer.json': ['Laravel', 'Symfony']
+}
+
+@lru_cache(maxsize=1)
+def _framework_patterns() -> Dict[str, "re.Pattern[str]"]:
+    """Une alternance compilée par fichier : une seule passe par ligne pour tous les frameworks"""
+    return {
+        config_file: re.compile("|".join(re.escape(fw.lower()) for fw in sorted(fws, key=len, reverse=True)))
+        for config_file, fws in CONFIG_FRAMEWORKS.items()
+    }
+
+@lru_cache(maxsize=1)
+def _framework_names() -> Dict[str, str]:
+    """Nom en minuscules (tel que capturé par les motifs) -> nom affiché du framework"""
+    return {fw.lower(): fw for fws in CONFIG_FRAMEWORKS.values() for fw in fws}
+
 class ProjectAnalyzer:
     """Analyse intelligente de la structure et du contenu du projet"""
     
-    def __init__(self, project_path: str = "."):
+    def __init__(self, project_path: str = ".", config: Optional[SmartDeployConfig] = None):
         self.project_path = Path(project_path)
+        self.config = config
         self.file_extensions = {}
         self.dependencies = []
         self.frameworks = []
+        self._analysis_cache: Optional[Dict[str, Any]] = None
         
     def analyze_project_structure(self) -> Dict[str, Any]:
+        """Analyse la structure du projet (calculée une fois, puis réutilisée par les outils de l'agent)"""
+        if self._analysis_cache is None:
+            self._analysis_cache = self._compute_analysis()
+        return self._analysis_cache
+    
+    def invalidate(self) -> None:
+        """Oublie l'analyse en cache (après modification du projet, ou dans les tests)"""
+        self._analysis_cache = None
+        self.__dict__.pop("scan", None)
+    
+    def _compute_analysis(self) -> Dict[str, Any]:
         """Analyse la structure du projet et détecte les technologies"""
+        # Sans configuration, toutes les détections sont actives
+        detect_languages = self.config is None or self.config.auto_detect_language
+        languages = self._detect_languages() if detect_languages else {}
+        frameworks = self._detect_frameworks()
         analysis = {
-            "languages": self._detect_languages(),
-            "frameworks": self._detect_frameworks(),
+            "languages": languages,
+            "frameworks": frameworks,
             "dependencies": self._extract_dependencies(),
             "project_type": self._determine_project_type(),
             "files_count": self._count_files(),
-            "suggested_topics": self._suggest_github_topics()
+            "suggested_topics": self._suggest_github_topics(languages, frameworks)
         }
         return analysis
     
+    @cached_property
+    def scan(self) -> ScanResult:
+        """Parcourt l'arborescence une seule fois : langages, compteurs et fichiers de configuration"""
+        result = ScanResult()
+        root = str(self.project_path)
+        kinds = _language_table()
+        for dirpath, dirnames, filenames in os.walk(root, topdown=True):
+            # Les dossiers cachés, de dépendances ou de build ne sont jamais parcourus
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.')]
+            if dirpath == root:
+                filenames = [f for f in filenames if not f.startswith('.')]
+                result.config_files_present.update(filenames)
+            
+            for name in filenames:
+                result.counts["total"] += 1
+                _, dot, ext = name.rpartition('.')
+                kind = kinds.get(ext.lower()) if dot else None
+                if kind is None:
+                    continue
+                category, lang = kind
+                if lang is not None:
+                    result.languages[lang] += 1
+                if category is not None:
+                    result.counts[category] += 1
+        
+        return result
+    
     def _detect_languages(self) -> Dict[str, int]:
         """Détecte les langages de programmation utilisés"""
-        language_map = {
-            '.py': 'Python', '.js': 'JavaScript', '.ts': 'TypeScript',
-            '.java': 'Java', '.cpp': 'C++', '.c': 'C', '.cs': 'C#',
-            '.php': 'PHP', '.rb': 'Ruby', '.go': 'Go', '.rs': 'Rust',
-            '.swift': 'Swift', '.kt': 'Kotlin', '.scala': 'Scala',
-            '.html': 'HTML', '.css': 'CSS', '.scss': 'SCSS',
-            '.vue': 'Vue', '.jsx': 'React', '.tsx': 'React'
-        }
-        
-        languages = {}
-        for file_path in self.project_path.rglob("*"):
-            if file_path.is_file() and not str(file_path).startswith('.'):
-                ext = file_path.suffix.lower()
-                if ext in language_map:
-                    lang = language_map[ext]
-                    languages[lang] = languages.get(lang, 0) + 1
-        
-        return dict(sorted(languages.items(), key=lambda x: x[1], reverse=True))
+        return dict(self.scan.languages.most_common())
     
     def _detect_frameworks(self) -> List[str]:
         """Détecte les frameworks utilisés"""
         frameworks = []
         
-        # Vérification des fichiers de configuration
-        config_files = {
-            'package.json': ['React', 'Vue', 'Angular', 'Express'],
-            'requirements.txt': ['Django', 'Flask', 'FastAPI'],
-            'pom.xml': ['Spring', 'Maven'],
-            'build.gradle': ['Spring Boot', 'Android'],
-            'Cargo.toml': ['Rust'],
-            'go.mod': ['Go'],
-            'composer.json': ['Laravel', 'Symfony']
-        }
-        
-        for config_file, possible_frameworks in config_files.items():
-            if (self.project_path / config_file).exists():
-                content = (self.project_path / config_file).read_text()
-                for framework in possible_frameworks:
-                    if framework.lower() in content.lower():
-                        frameworks.append(framework)
+        # Seuls les fichiers vus lors du parcours sont lus, ligne par ligne
+        present = self.scan.config_files_present
+        patterns, names = _framework_patterns(), _framework_names()
+        for config_file, possible_frameworks in CONFIG_FRAMEWORKS.items():
+            if config_file not in present:
+                continue
+            pattern = patterns[config_file]
+            remaining = set(possible_frameworks)
+            with open(self.project_path / config_file, "r", encoding="utf-8", errors="ignore") as f:
+                for line in f:
+                    found = {names[m.group(0)] for m in pattern.finditer(line.lower())} & remaining
+                    frameworks.extend(found)
+                    remaining -= found
+                    if not remaining:
+                        break  # Tous les frameworks possibles sont trouvés
         
         return list(set(frameworks))
     
@@ -105,14 +192,20 @@ class ProjectAnalyzer:
         # Python
         req_file = self.project_path / "requirements.txt"
         if req_file.exists():
-            deps = req_file.read_text().strip().split('\n')
-            dependencies.extend([dep.split('==')[0].split('>=')[0] for dep in deps if dep])
+            with open(req_file, "r", encoding="utf-8", errors="ignore") as f:
+                for line in f:
+                    dep = line.strip()
+                    if dep:
+                        dependencies.append(dep.split('==')[0].split('>=')[0])
+                    if len(dependencies) >= 10:
+                        break
         
         # Node.js
         package_file = self.project_path / "package.json"
         if package_file.exists():
             try:
-                package_data = json.loads(package_file.read_text())
+                with open(package_file, "r", encoding="utf-8") as f:
+                    package_data = json.load(f)
                 if 'dependencies' in package_data:
                     dependencies.extend(package_data['dependencies'].keys())
             except json.JSONDecodeError:
@@ -137,29 +230,14 @@ class ProjectAnalyzer:
     
     def _count_files(self) -> Dict[str, int]:
         """Compte les fichiers par type"""
-        counts = {"total": 0, "code": 0, "config": 0}
-        code_extensions = {'.py', '.js', '.ts', '.java', '.cpp', '.c', '.cs', '.php', '.rb', '.go', '.rs'}
-        config_extensions = {'.json', '.yml', '.yaml', '.toml', '.ini', '.cfg', '.conf'}
-        
-        for file_path in self.project_path.rglob("*"):
-            if file_path.is_file() and not str(file_path).startswith('.'):
-                counts["total"] += 1
-                ext = file_path.suffix.lower()
-                if ext in code_extensions:
-                    counts["code"] += 1
-                elif ext in config_extensions:
-                    counts["config"] += 1
-        
-        return counts
-    
-    def _suggest_github_topics(self) -> List[str]:
+        return dict(self.scan.counts)
+    
+    def _suggest_github_topics(self, languages: Dict[str, int], frameworks: List[str]) -> List[str]:
         """Suggère des topics GitHub basés sur l'analyse"""
         topics = []
-        languages = self._detect_languages()
-        frameworks = self._detect_frameworks()
         
         # Ajouter les langages principaux
-        for lang in list(languages.keys())[:3]:
+        for lang in islice(languages, 3):
             topics.append(lang.lower().replace('+', 'plus'))
         
         # Ajouter les frameworks
@@ -169,39 +247,131 @@ class ProjectAnalyzer:
         return topics[:5]  # Limite à 5 topics
 
 # === GÉNÉRATEUR IA DE CONTENU ===
+def _get_chat_openai():
+    """Importe ChatOpenAI à la demande (langchain_openai charge pydantic, tiktoken...)"""
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI
+
 class AIContentGenerator:
     """Génère du contenu intelligent pour le repository"""
     
-    def __init__(self, config: SmartDeployConfig):
+    def __init__(self, config: SmartDeployConfig, small_model: str = "gpt-4o-mini", large_model: str = "gpt-4o"):
+        ChatOpenAI = _get_chat_openai()
         self.config = config
+        # Le grand modèle est réservé au README ; le mode JSON n'est pas disponible sur gpt-4
         self.llm = ChatOpenAI(
             api_key=config.openai_api_key,
-            model="gpt-4",
-            temperature=0.7,
-            streaming=True,
-            callbacks=[StreamingStdOutCallbackHandler()]
+            model=large_model,
+            temperature=0.7
+        )
+        # Petit modèle pour le nom et la description : sorties courtes, latence dominée par le premier token
+        self.small_llm = ChatOpenAI(
+            api_key=config.openai_api_key,
+            model=small_model,
+            temperature=0.7
         )
     
-    def generate_repo_description(self, analysis: Dict[str, Any]) -> str:
-        """Génère une description intelligente du repository"""
+    def _invoke(self, prompt: str, json_mode: bool = False, small: bool = False):
+        """Envoie un prompt utilisateur unique au modèle"""
+        from langchain.schema import HumanMessage
+
+        llm = self.small_llm if small else self.llm
+        if json_mode:
+            llm = llm.bind(response_format={"type": "json_object"})
+        return llm.invoke([HumanMessage(content=prompt)])
+    
+    async def _ainvoke(self, prompt: str, json_mode: bool = False, small: bool = False):
+        """Version asynchrone de _invoke, pour lancer plusieurs générations en parallèle"""
+        from langchain.schema import HumanMessage
+
+        llm = self.small_llm if small else self.llm
+        if json_mode:
+            llm = llm.bind(response_format={"type": "json_object"})
+        return await llm.ainvoke([HumanMessage(content=prompt)])
+    
+    @staticmethod
+    def _json_field(response, key: str) -> str:
+        """Extrait un champ d'une réponse JSON (le texte brut sert de repli si le JSON est invalide)"""
+        try:
+            return str(json.loads(response.content)[key]).strip()
+        except (json.JSONDecodeError, KeyError, TypeError):
+            return response.content.strip()
+    
+    async def generate_all(self, analysis: Dict[str, Any], repo_name_hint: Optional[str] = None) -> Dict[str, str]:
+        """Génère le nom, la description et le README en un seul appel structuré"""
+        name_instruction = (
+            f'Le nom du repository est imposé : "{repo_name_hint}".' if repo_name_hint else
+            "Le nom doit être court (max 30 caractères), mémorable, professionnel et sans espaces (tirets)."
+        )
         prompt = f"""
+        Analyse ce projet de code et réponds UNIQUEMENT avec un objet JSON de la forme
+        {{"name": "...", "description": "...", "readme": "..."}}
+
+        Type de projet: {analysis['project_type']}
+        Langages: {', '.join(analysis['languages'].keys())}
+        Frameworks: {', '.join(analysis['frameworks'])}
+        Dépendances principales: {', '.join(analysis['dependencies'][:5])}
+        Nombre de fichiers: {analysis['files_count']['total']}
+
+        - name : {name_instruction}
+        - description : description concise et professionnelle en français (maximum 100 caractères),
+          qui met en valeur l'aspect technique du projet.
+        - readme : README.md complet en markdown (description engageante, prérequis, installation,
+          exemple d'utilisation, contribution, badges), professionnel mais accessible.
+        """
+        
+        try:
+            content = json.loads((await self._ainvoke(prompt, json_mode=True)).content)
+            name = repo_name_hint or content["name"]
+            return {
+                "name": name.strip().lower().replace(' ', '-'),
+                "description": content["description"].strip(),
+                "readme": content["readme"].strip()
+            }
+        except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+            print("⚠️  Réponse structurée invalide, génération séparée...")
+            
+            async def name_and_readme():
+                # Le README a besoin du nom : c'est la seule dépendance entre les générations
+                name = repo_name_hint or await self.asuggest_repo_name(analysis)
+                return name, await self.agenerate_readme_content(analysis, name)
+            
+            (name, readme), description = await asyncio.gather(
+                name_and_readme(),
+                self.agenerate_repo_description(analysis)
+            )
+            return {"name": name, "description": description, "readme": readme}
+    
+    @staticmethod
+    def _description_prompt(analysis: Dict[str, Any]) -> str:
+        """Prompt de génération de la description"""
+        return f"""
         Basé sur l'analyse suivante d'un projet de code, génère une description concise et professionnelle 
         pour un repository GitHub (maximum 100 caractères):
 
         Type de projet: {analysis['project_type']}
-        Langages principaux: {', '.join(list(analysis['languages'].keys())[:3])}
+        Langages principaux: {', '.join(islice(analysis['languages'], 3))}
         Frameworks détectés: {', '.join(analysis['frameworks'])}
         Nombre de fichiers: {analysis['files_count']['total']}
 
         La description doit être en français et mettre en valeur l'aspect technique du projet.
+        Réponds UNIQUEMENT avec un objet JSON de la forme {{"description": "..."}}
         """
-        
-        response = self.llm.invoke([HumanMessage(content=prompt)])
-        return response.content.strip()
     
-    def generate_readme_content(self, analysis: Dict[str, Any], repo_name: str) -> str:
-        """Génère un README.md complet et professionnel"""
-        prompt = f"""
+    def generate_repo_description(self, analysis: Dict[str, Any]) -> str:
+        """Génère une description intelligente du repository"""
+        response = self._invoke(self._description_prompt(analysis), json_mode=True, small=True)
+        return self._json_field(response, "description")
+    
+    async def agenerate_repo_description(self, analysis: Dict[str, Any]) -> str:
+        """Version asynchrone de generate_repo_description"""
+        response = await self._ainvoke(self._description_prompt(analysis), json_mode=True, small=True)
+        return self._json_field(response, "description")
+    
+    @staticmethod
+    def _readme_prompt(analysis: Dict[str, Any], repo_name: str) -> str:
+        """Prompt de génération du README"""
+        return f"""
         Crée un README.md complet et professionnel pour un projet GitHub avec les informations suivantes:
 
         Nom du projet: {repo_name}
@@ -220,17 +390,25 @@ class AIContentGenerator:
 
         Utilise le markdown et sois professionnel mais accessible.
         """
-        
-        response = self.llm.invoke([HumanMessage(content=prompt)])
+    
+    def generate_readme_content(self, analysis: Dict[str, Any], repo_name: str) -> str:
+        """Génère un README.md complet et professionnel"""
+        response = self._invoke(self._readme_prompt(analysis, repo_name))
         return response.content.strip()
     
-    def suggest_repo_name(self, analysis: Dict[str, Any]) -> str:
-        """Suggère un nom de repository intelligent"""
-        prompt = f"""
+    async def agenerate_readme_content(self, analysis: Dict[str, Any], repo_name: str) -> str:
+        """Version asynchrone de generate_readme_content"""
+        response = await self._ainvoke(self._readme_prompt(analysis, repo_name))
+        return response.content.strip()
+    
+    @staticmethod
+    def _name_prompt(analysis: Dict[str, Any]) -> str:
+        """Prompt de suggestion de nom"""
+        return f"""
         Suggère un nom de repository GitHub créatif et professionnel basé sur:
         
         Type de projet: {analysis['project_type']}
-        Langages principaux: {', '.join(list(analysis['languages'].keys())[:2])}
+        Langages principaux: {', '.join(islice(analysis['languages'], 2))}
         Frameworks: {', '.join(analysis['frameworks'][:2])}
         
         Le nom doit être:
@@ -239,11 +417,18 @@ class AIContentGenerator:
         - Professionnel
         - Sans espaces (utilise des tirets)
         
-        Réponds seulement avec le nom suggéré.
+        Réponds UNIQUEMENT avec un objet JSON de la forme {{"name": "..."}}
         """
-        
-        response = self.llm.invoke([HumanMessage(content=prompt)])
-        return response.content.strip().lower().replace(' ', '-')
+    
+    def suggest_repo_name(self, analysis: Dict[str, Any]) -> str:
+        """Suggère un nom de repository intelligent"""
+        response = self._invoke(self._name_prompt(analysis), json_mode=True, small=True)
+        return self._json_field(response, "name").lower().replace(' ', '-')
+    
+    async def asuggest_repo_name(self, analysis: Dict[str, Any]) -> str:
+        """Version asynchrone de suggest_repo_name"""
+        response = await self._ainvoke(self._name_prompt(analysis), json_mode=True, small=True)
+        return self._json_field(response, "name").lower().replace(' ', '-')
 
 # === AGENT INTELLIGENT DE DÉPLOIEMENT ===
 class SmartDeployAgent:
@@ -251,16 +436,32 @@ class SmartDeployAgent:
     
     def __init__(self, config: SmartDeployConfig):
         self.config = config
-        self.analyzer = ProjectAnalyzer()
+        self.analyzer = ProjectAnalyzer(config=config)
         self.content_generator = AIContentGenerator(config)
-        self.memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
-        
-        # Initialisation de l'agent avec des outils
-        self.tools = self._create_tools()
-        self.agent = self._create_agent()
     
-    def _create_tools(self) -> List[Tool]:
+    # Mémoire, outils et agent ne servent qu'à une interface conversationnelle :
+    # le déploiement appelle directement l'analyseur et le générateur, ils sont donc créés à la demande
+    @cached_property
+    def memory(self):
+        """Mémoire conversationnelle de l'agent"""
+        from langchain.memory import ConversationBufferMemory
+
+        return ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+    
+    @cached_property
+    def tools(self) -> List["Tool"]:
+        """Outils disponibles pour l'agent"""
+        return self._create_tools()
+    
+    @cached_property
+    def agent(self) -> "AgentExecutor":
+        """Agent OpenAI Functions (planification par le modèle)"""
+        return self._create_agent()
+    
+    def _create_tools(self) -> List["Tool"]:
         """Crée les outils disponibles pour l'agent"""
+        from langchain.tools import Tool
+
         tools = [
             Tool(
                 name="analyze_project",
@@ -285,8 +486,11 @@ class SmartDeployAgent:
         ]
         return tools
     
-    def _create_agent(self) -> AgentExecutor:
+    def _create_agent(self) -> "AgentExecutor":
         """Crée l'agent OpenAI Functions"""
+        from langchain.agents import AgentExecutor, create_openai_functions_agent
+        from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+
         prompt = ChatPromptTemplate.from_messages([
             ("system", """Tu es un assistant intelligent spécialisé dans le déploiement de projets sur GitHub.
             Tu peux analyser des projets de code, générer du contenu professionnel, et prendre des décisions
@@ -299,6 +503,7 @@ class SmartDeployAgent:
             MessagesPlaceholder(variable_name="agent_scratchpad")
         ])
         
+        ChatOpenAI = _get_chat_openai()
         llm = ChatOpenAI(
             api_key=self.config.openai_api_key,
             model="gpt-4",
@@ -323,12 +528,18 @@ class SmartDeployAgent:
         """Outil de création de README"""
         analysis = self.analyzer.analyze_project_structure()
         readme_content = self.content_generator.generate_readme_content(analysis, repo_name)
-        
-        # Écrire le README
+        return self._write_readme(readme_content)
+    
+    @staticmethod
+    def _write_readme(readme_content: str) -> str:
+        """Écrit le README.md du projet (écriture atomique : jamais de fichier tronqué sur Ctrl-C)"""
         readme_path = Path("README.md")
-        readme_path.write_text(readme_content, encoding='utf-8')
+        data = readme_content.encode('utf-8')
+        tmp_path = readme_path.with_suffix('.md.tmp')
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, readme_path)
         
-        return f"README.md créé avec succès ({len(readme_content)} caractères)"
+        return f"README.md créé avec succès ({len(data)} octets)"
     
     def _suggest_name_tool(self, input_str: str) -> str:
         """Outil de suggestion de nom"""
@@ -336,45 +547,48 @@ class SmartDeployAgent:
         suggested_name = self.content_generator.suggest_repo_name(analysis)
         return suggested_name
     
-    async def deploy_intelligently(self) -> Dict[str, Any]:
+    async def deploy_intelligently(self, repo_name_hint: Optional[str] = None) -> Dict[str, Any]:
         """Déploie le projet de manière intelligente"""
         print("🤖 Démarrage du déploiement intelligent...")
         
         # Étape 1: Analyse du projet
         print("\n📊 Analyse du projet...")
-        analysis_result = self.agent.invoke({
-            "input": "Analyse le projet actuel et donne-moi un résumé détaillé"
-        })
-        
-        # Étape 2: Génération du nom de repository
-        print("\n🏷️  Génération du nom de repository...")
-        name_result = self.agent.invoke({
-            "input": "Suggère un nom intelligent pour ce repository"
-        })
-        
-        # Étape 3: Génération de la description
-        print("\n📝 Génération de la description...")
-        description_result = self.agent.invoke({
-            "input": "Génère une description professionnelle pour ce repository"
-        })
+        analysis = self.analyzer.analyze_project_structure()
         
-        # Étape 4: Création du README
+        if not self.config.auto_generate_readme:
+            # Sans README, seuls le nom et la description sont générés (petit modèle)
+            print("\n📝 Génération du nom et de la description...")
+            name, description = await asyncio.gather(
+                self._resolve_name(analysis, repo_name_hint),
+                self.content_generator.agenerate_repo_description(analysis)
+            )
+            return {
+                "repo_name": name,
+                "description": description,
+                "analysis": analysis,
+                "readme_created": False
+            }
+        
+        # Étape 2: Nom, description et README en un seul appel au modèle
+        print("\n📝 Génération du nom, de la description et du README...")
+        content = await self.content_generator.generate_all(analysis, repo_name_hint)
+        
+        # Étape 3: Création du README
         print("\n📖 Création du README...")
-        readme_result = self.agent.invoke({
-            "input": f"Crée un README.md professionnel pour le repository"
-        })
-        
-        # Récupération des résultats
-        analysis = self.analyzer.analyze_project_structure()
-        suggested_name = self.content_generator.suggest_repo_name(analysis)
-        description = self.content_generator.generate_repo_description(analysis)
+        print(self._write_readme(content["readme"]))
         
         return {
-            "repo_name": suggested_name,
-            "description": description,
+            "repo_name": content["name"],
+            "description": content["description"],
             "analysis": analysis,
             "readme_created": True
         }
+    
+    async def _resolve_name(self, analysis: Dict[str, Any], repo_name_hint: Optional[str]) -> str:
+        """Nom imposé par l'utilisateur, sinon suggéré par le modèle"""
+        if repo_name_hint:
+            return repo_name_hint
+        return await self.content_generator.asuggest_repo_name(analysis)
 
 # === DÉPLOYEUR GITHUB INTELLIGENT ===
 class IntelligentGitHubDeployer:
@@ -383,12 +597,41 @@ class IntelligentGitHubDeployer:
     def __init__(self, config: SmartDeployConfig):
         self.config = config
         self.agent = SmartDeployAgent(config)
+        
+        # Session partagée : la connexion TLS à l'API GitHub est réutilisée entre les appels
+        self.session = requests.Session()
+        # Les méthodes non idempotentes (POST) ne sont pas rejouées par défaut : pas de doublons
+        retries = Retry(
+            total=5,
+            backoff_factor=1.0,
+            status_forcelist=[429, 502, 503, 504],
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retries)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"token {config.github_token}",
+            "Accept": "application/vnd.github+json",
+        })
+    
+    CREATE_REPOSITORY_MUTATION = """
+        mutation($input: CreateRepositoryInput!) {
+            createRepository(input: $input) { repository { id url } }
+        }
+    """
+    
+    UPDATE_TOPICS_MUTATION = """
+        mutation($repositoryId: ID!, $topicNames: [String!]!) {
+            updateTopics(input: {repositoryId: $repositoryId, topicNames: $topicNames}) { invalidTopicNames }
+        }
+    """
     
     async def deploy(self, custom_repo_name: Optional[str] = None) -> None:
         """Déploie le projet avec l'intelligence artificielle"""
         try:
             # Déploiement intelligent
-            smart_results = await self.agent.deploy_intelligently()
+            smart_results = await self.agent.deploy_intelligently(custom_repo_name)
             
             # Utilisation du nom personnalisé ou suggéré
             repo_name = custom_repo_name or smart_results["repo_name"]
@@ -399,10 +642,14 @@ class IntelligentGitHubDeployer:
             print(f"📄 Description: {description}")
             print(f"🔧 Technologies détectées: {', '.join(analysis['languages'].keys())}")
             
-            # Création du repository GitHub
-            await self._create_github_repo(repo_name, description, analysis)
+            # Création du repository GitHub (réseau) et préparation Git locale (disque)
+            # sont indépendantes : elles s'exécutent en parallèle
+            await asyncio.gather(
+                self._create_github_repo(repo_name, description, analysis),
+                self._prepare_local_repo()
+            )
             
-            # Configuration Git et push
+            # Configuration du remote et push (nécessite le repository distant)
             await self._setup_git_and_push(repo_name)
             
             print(f"\n✅ Déploiement intelligent terminé!")
@@ -416,56 +663,123 @@ class IntelligentGitHubDeployer:
         """Crée le repository GitHub avec les métadonnées intelligentes"""
         print("📡 Création du repository GitHub...")
         
-        headers = {
-            "Authorization": f"token {self.config.github_token}",
-            "Accept": "application/vnd.github+json",
-        }
-        
         # Détermination de la visibilité basée sur le type de projet
         is_private = "personal" in analysis.get("project_type", "").lower()
         
-        data = {
-            "name": repo_name,
-            "description": description,
-            "private": is_private,
-            "has_issues": True,
-            "has_projects": True,
-            "has_wiki": len(analysis.get("dependencies", [])) > 5,  # Wiki si projet complexe
-            "auto_init": False,
-            "license_template": "mit" if not is_private else None,
-            "topics": analysis.get("suggested_topics", [])
-        }
+        # Création via GraphQL : le champ "topics" de l'API REST est souvent ignoré
+        created = await asyncio.to_thread(self._graphql, self.CREATE_REPOSITORY_MUTATION, {
+            "input": {
+                "name": repo_name,
+                "description": description,
+                "visibility": "PRIVATE" if is_private else "PUBLIC",
+                "hasIssuesEnabled": True,
+                "hasWikiEnabled": len(analysis.get("dependencies", [])) > 5,  # Wiki si projet complexe
+            }
+        })
+        repository = created["createRepository"]["repository"]
         
-        response = requests.post("https://api.github.com/user/repos", headers=headers, json=data)
-        if response.status_code != 201:
-            raise Exception(f"Erreur GitHub: {response.status_code} - {response.text}")
+        topics = analysis.get("suggested_topics", [])
+        if topics:
+            await asyncio.to_thread(self._graphql, self.UPDATE_TOPICS_MUTATION, {
+                "repositoryId": repository["id"],
+                "topicNames": topics,
+            })
         
         print(f"✅ Repository créé: {'privé' if is_private else 'public'}")
     
-    async def _setup_git_and_push(self, repo_name: str) -> None:
-        """Configure Git et pousse le code"""
+    def _graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Exécute une requête GraphQL sur l'API GitHub et retourne le champ data"""
+        response = self._github_request(
+            "POST", "https://api.github.com/graphql", json={"query": query, "variables": variables}
+        )
+        payload = response.json() if response.ok else {}
+        if not response.ok or payload.get("errors"):
+            errors = payload.get("errors") or response.text
+            raise Exception(f"Erreur GitHub: {response.status_code} - {errors}")
+        return payload["data"]
+    
+    def _github_request(self, method: str, url: str, max_attempts: int = 4, **kwargs) -> requests.Response:
+        """Appel à l'API GitHub qui respecte les limites de débit (X-RateLimit-*, Retry-After)"""
+        for attempt in range(max_attempts):
+            response = self.session.request(method, url, **kwargs)
+            
+            remaining = int(response.headers.get("X-RateLimit-Remaining", "1"))
+            rate_limited = response.status_code == 429 or (
+                response.status_code == 403 and (remaining == 0 or "Retry-After" in response.headers)
+            )
+            if rate_limited and attempt < max_attempts - 1:
+                delay = self._rate_limit_delay(response, attempt)
+                print(f"⏳ Limite de l'API GitHub atteinte, nouvel essai dans {delay:.0f}s...")
+                time.sleep(delay)
+                continue
+            
+            # Quota épuisé : on attend la réinitialisation avant l'appel suivant
+            if not rate_limited and remaining <= 1:
+                reset = int(response.headers.get("X-RateLimit-Reset", "0"))
+                time.sleep(max(0.0, reset - time.time()) + random.uniform(0, 1))
+            return response
+        return response
+    
+    @staticmethod
+    def _rate_limit_delay(response: requests.Response, attempt: int) -> float:
+        """Délai d'attente avant de rejouer une requête limitée par GitHub"""
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            return float(retry_after)
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            reset = int(response.headers.get("X-RateLimit-Reset", "0"))
+            return max(0.0, reset - time.time()) + random.uniform(0, 1)
+        # Limite secondaire sans indication : backoff exponentiel
+        return 2 ** attempt * 30 + random.uniform(0, 1)
+    
+    @staticmethod
+    async def _run_git_commands(commands: List[List[str]]) -> None:
+        """Exécute des commandes Git dans l'ordre, sans bloquer la boucle d'événements"""
+        for cmd in commands:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+            _, stderr = await proc.communicate()
+            if proc.returncode != 0:
+                print(f"⚠️  Avertissement: {' '.join(cmd)} - {stderr.decode(errors='replace')}")
+    
+    async def _prepare_local_repo(self) -> None:
+        """Initialise le dépôt local et crée le commit initial"""
         print("📁 Configuration Git...")
         
+        # Dans un dépôt existant, init et renommage de branche sont inutiles
+        is_repo = Path(".git").exists()
+        commands = [] if is_repo else [["git", "init"]]
+        commands += [
+            ["git", "add", "."],
+            ["git", "commit", "-m", "🚀 Initial commit - Deployed with AI"]
+        ]
+        if not is_repo:
+            commands.append(["git", "branch", "-M", "main"])
+        await self._run_git_commands(commands)
+    
+    async def _setup_git_and_push(self, repo_name: str) -> None:
+        """Configure le remote et pousse le code"""
+
         # URL du repository
         if self.config.use_ssh:
             remote_url = f"git@github.com:{self.config.github_username}/{repo_name}.git"
         else:
             remote_url = f"https://github.com/{self.config.github_username}/{repo_name}.git"
         
-        # Commandes Git
+        # Un remote origin existant est mis à jour plutôt que recréé
+        proc = await asyncio.create_subprocess_exec(
+            "git", "remote", "get-url", "origin",
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
+        )
+        remote_action = "set-url" if await proc.wait() == 0 else "add"
+        
+        # Commandes Git (HEAD:main : la branche courante d'un dépôt existant n'est pas renommée)
         commands = [
-            ["git", "init"],
-            ["git", "add", "."],
-            ["git", "commit", "-m", "🚀 Initial commit - Deployed with AI"],
-            ["git", "branch", "-M", "main"],
-            ["git", "remote", "add", "origin", remote_url],
-            ["git", "push", "-u", "origin", "main"]
+            ["git", "remote", remote_action, "origin", remote_url],
+            ["git", "push", "-u", "origin", "HEAD:main"]
         ]
-        
-        for cmd in commands:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                print(f"⚠️  Avertissement: {' '.join(cmd)} - {result.stderr}")
+        await self._run_git_commands(commands)
         
         print("✅ Code poussé vers GitHub")
 
@@ -492,21 +806,25 @@ async def main():
     return 0
 
 if __name__ == "__main__":
-    # Installation des dépendances requises
-    required_packages = [
-        "langchain",
-        "langchain-openai", 
-        "requests",
-        "openai"
-    ]
-    
-    print("📦 Vérification des dépendances...")
-    for package in required_packages:
-        try:
-            __import__(package.replace('-', '_'))
-        except ImportError:
-            print(f"⚠️  Installation de {package}...")
-            subprocess.run(["pip", "install", package], check=True)
+    parser = argparse.ArgumentParser(description="Déployeur intelligent de projets sur GitHub")
+    parser.add_argument("--install-deps", action="store_true",
+                        help="Installe les dépendances manquantes avant le déploiement")
+    args = parser.parse_args()
+    
+    if args.install_deps:
+        required_packages = [
+            "langchain",
+            "langchain-openai", 
+            "requests",
+            "openai"
+        ]
+        
+        print("📦 Vérification des dépendances...")
+        for package in required_packages:
+            # find_spec localise le module sans l'importer
+            if importlib.util.find_spec(package.replace('-', '_')) is None:
+                print(f"⚠️  Installation de {package}...")
+                subprocess.run([sys.executable, "-m", "pip", "install", package], check=True)
     
     # Exécution
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())